@@ -1,61 +1,83 @@
 import numpy as np
-from scipy.constants import k as boltzmann_constant
+from numba import njit
 from typing import Dict, Tuple, List
 
-def rainflow(signal: np.ndarray, min_delta_T: float = 0.1) -> Tuple[np.ndarray, int]:
-    """Rainflow counting algorithm for cycle counting."""
-    diff = np.diff(signal)
-    peaks = np.where((diff[:-1] > 0) & (diff[1:] <= 0))[0] + 1
-    valleys = np.where((diff[:-1] < 0) & (diff[1:] >= 0))[0] + 1
-    extrema = np.sort(np.concatenate((peaks, valleys, [0, len(signal)-1])))
+KB_EV: float = 8.617333262e-5  # Boltzmann constant in eV/K
+
+@njit(cache=True, nogil=True)
+def _rainflow_core(ext_vals: np.ndarray, min_delta_T: float, out: np.ndarray) -> int:
+    """Three-point rainflow reduction over extrema values, writing (amplitude, mean, count) rows into out.
     
-    cycles = []
-    stack = []
-    for i in range(len(extrema) - 1):
-        stack.append(i)
-        while len(stack) >= 3:
-            i1, i2, i3 = stack[-3:]
-            x1, x2, x3 = signal[extrema[i1]], signal[extrema[i2]], signal[extrema[i3]]
+    out must have at least len(ext_vals) rows; returns the number of rows written.
+    """
+    n_ext = len(ext_vals)
+    stack = np.empty(n_ext, dtype=np.int32)
+    k = 0
+    top = 0
+    for i in range(n_ext - 1):
+        stack[top] = i
+        top += 1
+        while top >= 3:
+            x1, x2, x3 = ext_vals[stack[top-3]], ext_vals[stack[top-2]], ext_vals[stack[top-1]]
             delta_T = abs(x2 - x1)
             if delta_T >= min_delta_T and abs(x3 - x2) <= abs(x2 - x1):
-                amplitude = delta_T / 2
-                mean = (x1 + x2) / 2
-                cycles.append([amplitude, mean, 1])
-                stack.pop(-2)
+                out[k, 0] = delta_T / 2
+                out[k, 1] = (x1 + x2) / 2
+                out[k, 2] = 1.0
+                k += 1
+                stack[top-2] = stack[top-1]
+                top -= 1
             else:
                 break
     
-    while len(stack) >= 2:
-        i1, i2 = stack[-2:]
-        x1, x2 = signal[extrema[i1]], signal[extrema[i2]]
+    while top >= 2:
+        x1, x2 = ext_vals[stack[top-2]], ext_vals[stack[top-1]]
         delta_T = abs(x2 - x1)
         if delta_T >= min_delta_T:
-            amplitude = delta_T / 2
-            mean = (x1 + x2) / 2
-            cycles.append([amplitude, mean, 0.5])
-        stack.pop()
+            out[k, 0] = delta_T / 2
+            out[k, 1] = (x1 + x2) / 2
+            out[k, 2] = 0.5
+            k += 1
+        top -= 1
+    
+    return k
+
+def rainflow(signal: np.ndarray, min_delta_T: float = 0.1) -> Tuple[np.ndarray, int]:
+    """Rainflow counting algorithm for cycle counting."""
+    if len(signal) == 0:
+        return np.empty((0, 3)), 0
+    
+    # Peaks (rise then fall/flat) and valleys (fall then rise/flat) in one pass over the slope signs:
+    # an extremum is wherever a non-zero slope sign changes. Indices come out ascending, so no sort is needed.
+    slope = np.sign(np.diff(signal)).astype(np.int8)
+    turn = slope[1:] != slope[:-1]
+    turn &= slope[:-1] != 0
+    extrema = np.concatenate(([0], np.flatnonzero(turn) + 1, [len(signal)-1]))
     
-    return np.array(cycles), len(cycles)
+    ext_vals = np.ascontiguousarray(signal[extrema], dtype=np.float64)
+    # Each extremum closes at most one cycle, so len(ext_vals) rows always suffice
+    out = np.empty((len(ext_vals), 3))
+    k = _rainflow_core(ext_vals, float(min_delta_T), out)
+    return out[:k], k
 
-def calculate_cycles_to_failure(delta_T: float, T_mean: float, params: Dict[str, float]) -> float:
-    """Calculate cycles to failure based on temperature cycle amplitude and mean temperature."""
-    A, n, Ea = params['A'], params['n'], params['Ea']
-    kb = boltzmann_constant / 1.60218e-19  # Convert to eV/K
+def calculate_cycles_to_failure(delta_T: np.ndarray, T_mean: np.ndarray, params: Dict[str, float]) -> np.ndarray:
+    """Calculate cycles to failure based on temperature cycle amplitude and mean temperature (element-wise)."""
+    A, n = params['A'], params['n']
+    Ea_over_kb = params['Ea_over_kb'] if 'Ea_over_kb' in params else params['Ea'] / KB_EV
     T_kelvin = T_mean + 273.15
-    N_f = A * (delta_T ** -n) * np.exp(Ea / (kb * T_kelvin))
-    return max(N_f, 1)
+    # A * delta_T**-n * exp(Ea / (kb * T)) folded into a single exp of the log-sum (one log + one exp, no pow)
+    N_f = np.exp(np.log(A) - n * np.log(delta_T) + Ea_over_kb / T_kelvin)
+    return np.maximum(N_f, 1)
 
 def miners_rule_degradation(cycles: np.ndarray, params: Dict[str, float]) -> Tuple[float, List[Tuple[float, float]]]:
     """Calculate degradation using Miner's rule and return cycles to failure for each temperature cycle."""
     if len(cycles) == 0:
         return 0, []
     
-    damage = 0
-    cycles_to_failure = []
-    for delta_T, T_mean, n in cycles:
-        N_f = calculate_cycles_to_failure(delta_T, T_mean, params)
-        damage += n / N_f
-        cycles_to_failure.append((delta_T, N_f))
+    delta_T, T_mean, n = cycles.T
+    N_f = calculate_cycles_to_failure(delta_T, T_mean, params)
+    damage = float((n / N_f).sum())
+    cycles_to_failure = list(zip(delta_T.tolist(), N_f.tolist()))
     
     return max(damage, 1e-10), cycles_to_failure  # Ensure some minimal degradation
 
@@ -1,12 +1,15 @@
 import logging
 import os
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
+import matplotlib
+matplotlib.use('Agg')  # Plots are only saved to file; skip GUI backend initialization
 import matplotlib.pyplot as plt
 import numpy as np
-from mosfet_params import MOSFET_PARAMS, VRT, IRT
+from mosfet_params import MOSFET_PARAMS, VRT_T, VRT_Y, IRT_T, IRT_Y
 from thermal_simulation import run_thermal_simulation
 from lifetime_estimation import estimate_lifetime
 import json
+import orjson
 
 # Set up logging
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -23,40 +26,61 @@ OUTPUT_DIR = os.path.join(SCRIPT_DIR, 'output')
 
 SimulationResult = Dict[str, Any]
 
+# Figure and axes reused by plot_results across calls (created on first use)
+_results_figure: Optional[Tuple[plt.Figure, np.ndarray]] = None
+
+def simulate_mosfet(mosfet_name: str, params: Dict[str, Any]) -> Optional[SimulationResult]:
+    """Run the thermal simulation and lifetime estimation for a single MOSFET."""
+    logger.info(f"Simulating {mosfet_name}")
+    try:
+        t, t_j, v_ds, i_d, p_total, p_cond, p_sw, p_cap = run_thermal_simulation(params, (VRT_T, VRT_Y), (IRT_T, IRT_Y), T_AMB, F_SW)
+        degradation, estimated_years, total_cycles, cycles_to_failure = estimate_lifetime(t_j, params['LIFETIME_PARAMS'])
+        
+        result = {
+            't': t,
+            't_j': t_j,
+            'v_ds': v_ds,
+            'i_d': i_d,
+            'p_total': p_total,
+            'p_cond': p_cond,
+            'p_sw': p_sw,
+            'p_cap': p_cap,
+            'degradation': degradation,
+            'estimated_years': estimated_years,
+            'total_cycles': total_cycles,
+            'cycles_to_failure': cycles_to_failure
+        }
+        logger.info(f"Simulation for {mosfet_name} completed successfully")
+        return result
+    except Exception as e:
+        logger.exception(f"Error simulating {mosfet_name}: {str(e)}")
+        return None
+
 def run_simulation() -> Dict[str, SimulationResult]:
     """Run simulation for all MOSFETs."""
     results = {}
     
     for mosfet_name, params in MOSFET_PARAMS.items():
-        logger.info(f"Simulating {mosfet_name}")
-        try:
-            t, t_j, v_ds, i_d, p_total, p_cond, p_sw, p_cap = run_thermal_simulation(params, VRT, IRT, T_AMB, F_SW)
-            degradation, estimated_years, total_cycles, cycles_to_failure = estimate_lifetime(t_j, params['LIFETIME_PARAMS'])
-            
-            results[mosfet_name] = {
-                't': t,
-                't_j': t_j,
-                'v_ds': v_ds,
-                'i_d': i_d,
-                'p_total': p_total,
-                'p_cond': p_cond,
-                'p_sw': p_sw,
-                'p_cap': p_cap,
-                'degradation': degradation,
-                'estimated_years': estimated_years,
-                'total_cycles': total_cycles,
-                'cycles_to_failure': cycles_to_failure
-            }
-            logger.info(f"Simulation for {mosfet_name} completed successfully")
-        except Exception as e:
-            logger.exception(f"Error simulating {mosfet_name}: {str(e)}")
+        result = simulate_mosfet(mosfet_name, params)
+        if result is not None:
+            results[mosfet_name] = result
     
     return results
 
+def get_results_figure() -> Tuple[plt.Figure, np.ndarray]:
+    """Return the cached results figure and axes, creating them on first use and clearing them otherwise."""
+    global _results_figure
+    if _results_figure is None:
+        _results_figure = plt.subplots(3, 1, figsize=(12, 15))
+    else:
+        for ax in _results_figure[1]:
+            ax.clear()
+    return _results_figure
+
 def plot_results(results: Dict[str, SimulationResult]) -> None:
     """Plot simulation results."""
     try:
-        fig, axes = plt.subplots(3, 1, figsize=(12, 15))
+        fig, axes = get_results_figure()
         
         plot_data = [
             ('Junction Temperature', 't_j', '°C'),
@@ -73,15 +97,14 @@ def plot_results(results: Dict[str, SimulationResult]) -> None:
             ax.legend()
             ax.grid(True)
 
-        plt.tight_layout()
+        fig.tight_layout()
         
         # Ensure the output directory exists
         os.makedirs(OUTPUT_DIR, exist_ok=True)
         
         file_path = os.path.join(OUTPUT_DIR, 'simulation_results.png')
-        plt.savefig(file_path)
+        fig.savefig(file_path, dpi=90, bbox_inches='tight')
         logger.info(f"Simulation results plot saved as {file_path}")
-        plt.close()
     except Exception as e:
         logger.exception(f"Error plotting results: {str(e)}")
 
@@ -117,20 +140,25 @@ def print_results(results: Dict[str, SimulationResult]) -> None:
         print(f"Average Switching Loss: {np.mean(data['p_sw']):.2f} W")
         print(f"Average Capacitive Loss: {np.mean(data['p_cap']):.2f} W")
 
+def all_finite(json_data: Dict[str, Dict[str, Any]]) -> bool:
+    """Check that every number in the export payload (scalars, traces and cycle lists) is finite."""
+    return all(np.isfinite(np.asarray(value, dtype=np.float64)).all()
+               for mosfet_data in json_data.values() for value in mosfet_data.values())
+
 def export_results_as_json(results: Dict[str, SimulationResult]) -> None:
     """Export simulation results as JSON for the dashboard."""
     try:
         json_data = {}
         for mosfet_name, data in results.items():
             json_data[mosfet_name] = {
-                't': data['t'].tolist(),
-                't_j': data['t_j'].tolist(),
-                'v_ds': data['v_ds'].tolist(),
-                'i_d': data['i_d'].tolist(),
-                'p_total': data['p_total'].tolist(),
-                'p_cond': data['p_cond'].tolist(),
-                'p_sw': data['p_sw'].tolist(),
-                'p_cap': data['p_cap'].tolist(),
+                't': data['t'],
+                't_j': data['t_j'],
+                'v_ds': data['v_ds'],
+                'i_d': data['i_d'],
+                'p_total': data['p_total'],
+                'p_cond': data['p_cond'],
+                'p_sw': data['p_sw'],
+                'p_cap': data['p_cap'],
                 'peak_power': float(np.max(data['p_total'])),
                 'peak_temp': float(np.max(data['t_j'])),
                 'degradation': float(data['degradation']),
@@ -144,8 +172,14 @@ def export_results_as_json(results: Dict[str, SimulationResult]) -> None:
         os.makedirs(OUTPUT_DIR, exist_ok=True)
         
         file_path = os.path.join(OUTPUT_DIR, 'simulation_results.json')
-        with open(file_path, 'w') as f:
-            json.dump(json_data, f, indent=2)
+        if all_finite(json_data):
+            # orjson serializes the ndarrays directly, without an intermediate list of Python floats
+            with open(file_path, 'wb') as f:
+                f.write(orjson.dumps(json_data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2))
+        else:
+            # orjson writes inf/NaN as null, which the dashboard cannot format; keep json's Infinity/NaN
+            with open(file_path, 'w') as f:
+                json.dump(json_data, f, indent=2, default=lambda o: o.tolist())
         logger.info(f"Results exported as JSON to {file_path}")
     except Exception as e:
         logger.exception(f"Error exporting results as JSON: {str(e)}")
@@ -1,4 +1,6 @@
+import numpy as np
 from typing import Dict, Any
+from lifetime_estimation import KB_EV
 
 MOSFETParams = Dict[str, Any]
 
@@ -49,6 +51,13 @@ MOSFET_PARAMS: Dict[str, MOSFETParams] = {
     }
 }
 
+# Store the thermal network as float64 arrays so it can be scaled with vector ops,
+# and fold the Arrhenius activation energy into Ea / kb once
+for _params in MOSFET_PARAMS.values():
+    _params['R_TH'] = np.asarray(_params['R_TH'], dtype=np.float64)
+    _params['C_TH'] = np.asarray(_params['C_TH'], dtype=np.float64)
+    _params['LIFETIME_PARAMS']['Ea_over_kb'] = _params['LIFETIME_PARAMS']['Ea'] / KB_EV
+
 # Voltage and current waveforms
 VRT = [
     (0.0, 0), (0.2, 286), (0.5, 203), (3.0, 203),
@@ -57,4 +66,10 @@ VRT = [
 IRT = [
     (0.0, 0.0), (0.2, 0.5), (0.5, 1.1), (3.0, 1.1),
     (3.5, 0.53), (13.8, 0.53), (14.0, 0.0), (14.2, 0.0), (14.8, 0.0)
-]
\ No newline at end of file
+]
+
+# Waveforms as separate float64 time/value arrays (structure of arrays) for the simulation
+VRT_T = np.array([point[0] for point in VRT], dtype=np.float64)
+VRT_Y = np.array([point[1] for point in VRT], dtype=np.float64)
+IRT_T = np.array([point[0] for point in IRT], dtype=np.float64)
+IRT_Y = np.array([point[1] for point in IRT], dtype=np.float64)
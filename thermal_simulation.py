@@ -1,104 +1,163 @@
 import numpy as np
 from scipy.integrate import solve_ivp
-from scipy.interpolate import interp1d
-from typing import Tuple, List, Callable, Dict, Any
+from numba import njit
+from typing import Tuple, Callable, Dict, Any, Union
 
 MOSFETParams = Dict[str, Any]
 InterpolatedFunc = Callable[[np.ndarray], np.ndarray]
+FloatOrArray = Union[float, np.ndarray]
+WaveformArrays = Tuple[np.ndarray, np.ndarray]
 
-def create_interpolation_function(waveform: List[Tuple[float, float]]) -> InterpolatedFunc:
-    """Create an interpolation function for a given waveform."""
-    t, y = zip(*waveform)
-    return interp1d(t, y, kind='linear', bounds_error=False, fill_value='extrapolate')
+# Order of the electrical coefficients passed to the jitted power dissipation kernel
+ELECTRICAL_KEYS = ('R_DS_ON_25', 'R_DS_ON_TEMP_COEFF', 'T_ON_25', 'T_OFF_25', 'K_T_SW',
+                   'E_OSS_25', 'K_E_OSS', 'Q_RR_25', 'K_Q_RR', 'C_OSS')
 
-def interpolate_waveforms(vrt: List[Tuple[float, float]], irt: List[Tuple[float, float]]) -> Tuple[InterpolatedFunc, InterpolatedFunc]:
+def create_interpolation_function(waveform: WaveformArrays) -> InterpolatedFunc:
+    """Create a linear interpolation function for a given waveform (held constant outside the sampled range)."""
+    t, y = waveform
+    return lambda x: np.interp(x, t, y)
+
+def interpolate_waveforms(vrt: WaveformArrays, irt: WaveformArrays) -> Tuple[InterpolatedFunc, InterpolatedFunc]:
     """Create interpolation functions for voltage and current waveforms."""
     v_interp = create_interpolation_function(vrt)
     i_interp = create_interpolation_function(irt)
     return v_interp, i_interp
 
-def calculate_power_dissipation(v_ds: float, i_d: float, t_j: float, params: MOSFETParams, f_sw: float) -> Tuple[float, float, float, float]:
-    """Calculate power dissipation with enhanced switching loss and capacitive loss."""
-    r_ds_on = params['R_DS_ON_25'] * (1 + params['R_DS_ON_TEMP_COEFF'] * (t_j - 25))
+def _as_float_arrays(waveform: WaveformArrays) -> WaveformArrays:
+    """Ensure waveform sample arrays are contiguous float64, as the jitted kernels expect."""
+    t, y = waveform
+    return np.ascontiguousarray(t, dtype=np.float64), np.ascontiguousarray(y, dtype=np.float64)
+
+def electrical_coefficients(params: MOSFETParams) -> Tuple[float, ...]:
+    """Extract the electrical loss coefficients of a MOSFET as a flat tuple of floats for the jitted kernels."""
+    return tuple(float(params[key]) for key in ELECTRICAL_KEYS)
+
+@njit(cache=True, nogil=True)
+def _power_dissipation(v_ds, i_d, t_j, coeffs, f_sw):
+    """Power dissipation kernel shared by the ODE right-hand side and post-processing."""
+    r_ds_on_25, r_ds_on_temp_coeff, t_on_25, t_off_25, k_t_sw, e_oss_25, k_e_oss, q_rr_25, k_q_rr, c_oss = coeffs
+    r_ds_on = r_ds_on_25 * (1 + r_ds_on_temp_coeff * (t_j - 25))
     p_cond = i_d**2 * r_ds_on
     
-    t_on = params['T_ON_25'] * (1 + params['K_T_SW'] * (t_j - 25))
-    t_off = params['T_OFF_25'] * (1 + params['K_T_SW'] * (t_j - 25))
-    e_oss = params['E_OSS_25'] * (1 + params['K_E_OSS'] * (t_j - 25))
-    q_rr = params['Q_RR_25'] * (1 + params['K_Q_RR'] * (t_j - 25))
+    t_on = t_on_25 * (1 + k_t_sw * (t_j - 25))
+    t_off = t_off_25 * (1 + k_t_sw * (t_j - 25))
+    e_oss = e_oss_25 * (1 + k_e_oss * (t_j - 25))
+    q_rr = q_rr_25 * (1 + k_q_rr * (t_j - 25))
     
     e_on = 0.5 * v_ds * i_d * t_on
     e_off = 0.5 * v_ds * i_d * t_off
     e_rr = v_ds * q_rr
     
     p_sw = (e_on + e_off + e_oss + e_rr) * f_sw
-    p_cap = 0.5 * params['C_OSS'] * v_ds**2 * f_sw
+    p_cap = 0.5 * c_oss * v_ds**2 * f_sw
     
     p_total = p_cond + p_sw + p_cap
     return p_total, p_cond, p_sw, p_cap
 
-def non_linear_thermal_properties(t_j: float, params: MOSFETParams) -> Tuple[List[float], List[float]]:
-    """Calculate non-linear thermal resistance and capacitance based on junction temperature."""
-    r_th = [r * (1 + 0.005 * (t_j - 25)) for r in params['R_TH']]
-    c_th = [c * (1 + 0.002 * (t_j - 25)) for c in params['C_TH']]
+def calculate_power_dissipation(v_ds: FloatOrArray, i_d: FloatOrArray, t_j: FloatOrArray, params: MOSFETParams, f_sw: float) -> Tuple[FloatOrArray, FloatOrArray, FloatOrArray, FloatOrArray]:
+    """Calculate power dissipation with enhanced switching loss and capacitive loss (scalars or element-wise over arrays)."""
+    return _power_dissipation(v_ds, i_d, t_j, electrical_coefficients(params), float(f_sw))
+
+@njit(cache=True, nogil=True)
+def _non_linear_thermal_properties(t_j, r_th_25, c_th_25):
+    """Scale the 25 degC thermal resistances and capacitances to junction temperature t_j."""
+    r_th = r_th_25 * (1 + 0.005 * (t_j - 25))
+    c_th = c_th_25 * (1 + 0.002 * (t_j - 25))
     return r_th, c_th
 
-def thermal_model(t: float, y: np.ndarray, params: MOSFETParams, v_ds_func: InterpolatedFunc, i_d_func: InterpolatedFunc, t_amb: float, f_sw: float) -> np.ndarray:
-    """Enhanced thermal model with cooling effects."""
+def non_linear_thermal_properties(t_j: float, params: MOSFETParams) -> Tuple[np.ndarray, np.ndarray]:
+    """Calculate non-linear thermal resistance and capacitance based on junction temperature."""
+    r_th_25 = np.asarray(params['R_TH'], dtype=np.float64)
+    c_th_25 = np.asarray(params['C_TH'], dtype=np.float64)
+    return _non_linear_thermal_properties(float(t_j), r_th_25, c_th_25)
+
+@njit(cache=True, fastmath=True, nogil=True)
+def thermal_model(t: float, y: np.ndarray, r_th_25: np.ndarray, c_th_25: np.ndarray, coeffs: Tuple[float, ...], g_cool: float, v_wave: WaveformArrays, i_wave: WaveformArrays, t_amb: float, f_sw: float) -> np.ndarray:
+    """Enhanced thermal model with cooling effects (jitted; parameters pre-extracted by thermal_model_args)."""
     t_j = y[0] + t_amb
-    r_th, c_th = non_linear_thermal_properties(t_j, params)
+    r_th, c_th = _non_linear_thermal_properties(t_j, r_th_25, c_th_25)
     n = len(r_th)
     
-    v_ds = v_ds_func(np.array([t]))[0]
-    i_d = i_d_func(np.array([t]))[0]
-    p_total, _, _, _ = calculate_power_dissipation(v_ds, i_d, t_j, params, f_sw)
+    # Same np.interp (end values held) as create_interpolation_function, so post-processing matches the forcing
+    v_ds = np.interp(t, v_wave[0], v_wave[1])
+    i_d = np.interp(t, i_wave[0], i_wave[1])
+    p_total, _, _, _ = _power_dissipation(v_ds, i_d, t_j, coeffs, f_sw)
     
     # Cooling effect
-    p_cool = params['COOLING_COEFF'] * params['SURFACE_AREA'] * (t_j - t_amb)
+    p_cool = g_cool * (t_j - t_amb)
+    
+    dy = np.empty(n)
+    dy[0] = (p_total - p_cool - (y[0] - (y[1] if n > 1 else 0)) / r_th[0]) / c_th[0]
+    
+    # Heat flux through each ladder edge is computed once and shared by the two nodes it connects
+    flux_in = (y[0] - y[1]) / r_th[1] if n > 1 else 0.0
+    for i in range(1, n):
+        if i < n-1:
+            flux_out = (y[i] - y[i+1]) / r_th[i+1]
+        else:
+            flux_out = (y[i] - t_amb) / r_th[i]
+        dy[i] = (flux_in - flux_out) / c_th[i]
+        flux_in = flux_out
     
-    dy = np.zeros(n)
+    return dy
+
+def thermal_model_args(params: MOSFETParams, vrt: WaveformArrays, irt: WaveformArrays, t_amb: float, f_sw: float) -> Tuple[Any, ...]:
+    """Hoist MOSFET parameters and waveforms into the plain floats and arrays thermal_model expects after (t, y)."""
+    r_th_25 = np.asarray(params['R_TH'], dtype=np.float64)
+    c_th_25 = np.asarray(params['C_TH'], dtype=np.float64)
+    g_cool = float(params['COOLING_COEFF'] * params['SURFACE_AREA'])
+    return (r_th_25, c_th_25, electrical_coefficients(params), g_cool,
+            _as_float_arrays(vrt), _as_float_arrays(irt), float(t_amb), float(f_sw))
+
+def thermal_jacobian(t: float, y: np.ndarray, r_th_25: np.ndarray, c_th_25: np.ndarray, g_cool: float, t_amb: float) -> np.ndarray:
+    """Tri-diagonal Jacobian of the thermal ladder, evaluated at the current junction temperature."""
+    t_j = y[0] + t_amb
+    r_th, c_th = _non_linear_thermal_properties(float(t_j), r_th_25, c_th_25)
+    n = len(r_th)
+    
+    jac = np.zeros((n, n))
     for i in range(n):
         if i == 0:
-            dy[i] = (p_total - p_cool - (y[i] - (y[i+1] if i+1 < n else 0)) / r_th[i]) / c_th[i]
+            jac[i, i] = (-g_cool - 1 / r_th[i]) / c_th[i]
+            if i+1 < n:
+                jac[i, i+1] = 1 / (r_th[i] * c_th[i])
         elif i == n-1:
-            dy[i] = ((y[i-1] - y[i]) / r_th[i] - (y[i] - t_amb) / r_th[i]) / c_th[i]
+            jac[i, i-1] = 1 / (r_th[i] * c_th[i])
+            jac[i, i] = -2 / (r_th[i] * c_th[i])
         else:
-            dy[i] = ((y[i-1] - y[i]) / r_th[i] - (y[i] - y[i+1]) / r_th[i+1]) / c_th[i]
+            jac[i, i-1] = 1 / (r_th[i] * c_th[i])
+            jac[i, i] = -(1 / r_th[i] + 1 / r_th[i+1]) / c_th[i]
+            jac[i, i+1] = 1 / (r_th[i+1] * c_th[i])
     
-    return dy
+    return jac
 
-def run_thermal_simulation(params: MOSFETParams, vrt: List[Tuple[float, float]], irt: List[Tuple[float, float]], t_amb: float, f_sw: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+def run_thermal_simulation(params: MOSFETParams, vrt: WaveformArrays, irt: WaveformArrays, t_amb: float, f_sw: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     """Run thermal simulation for a single MOSFET."""
-    # Create time array based on the data points in VRT
-    t = np.unique(np.array([point[0] for point in vrt + irt]))
-    t.sort()
+    # Create time array based on the data points in VRT and IRT
+    t = np.unique(np.concatenate((vrt[0], irt[0])))
     
     v_func, i_func = interpolate_waveforms(vrt, irt)
+    rhs_args = thermal_model_args(params, vrt, irt, t_amb, f_sw)
+    r_th_25, c_th_25, _, g_cool = rhs_args[:4]
     
-    y0 = np.zeros(len(params['R_TH']))
+    y0 = np.zeros(len(r_th_25))
     
     solution = solve_ivp(
-        lambda t, y: thermal_model(t, y, params, v_func, i_func, t_amb, f_sw),
+        lambda t, y: thermal_model(t, y, *rhs_args),
         (t[0], t[-1]),
         y0,
         t_eval=t,
-        method='Radau',
-        rtol=1e-8,
-        atol=1e-8,
-        max_step=1e-4
+        method='LSODA',
+        jac=lambda t, y: thermal_jacobian(t, y, r_th_25, c_th_25, g_cool, t_amb),
+        rtol=1e-6,
+        atol=1e-8
     )
     
     t_j = solution.y[0, :] + t_amb
     v_ds = v_func(t)
     i_d = i_func(t)
     
-    # Calculate power dissipation components for each time step
-    p_total = np.zeros_like(t)
-    p_cond = np.zeros_like(t)
-    p_sw = np.zeros_like(t)
-    p_cap = np.zeros_like(t)
-    
-    for i in range(len(t)):
-        p_total[i], p_cond[i], p_sw[i], p_cap[i] = calculate_power_dissipation(v_ds[i], i_d[i], t_j[i], params, f_sw)
+    # Calculate power dissipation components for all time steps at once
+    p_total, p_cond, p_sw, p_cap = calculate_power_dissipation(v_ds, i_d, t_j, params, f_sw)
     
     return t, t_j, v_ds, i_d, p_total, p_cond, p_sw, p_cap